@@ -3,13 +3,21 @@ Python package for working with ToneScript, a syntax for describing the characte
 call progress tones used in telephony.
 """
 
+from ._buffer import ToneRenderer
+from ._buffer import render_into
 from ._parser import parse
 from ._parser import unparse
 from ._wave import render
+from ._wave import render_mix
+from .audio import Track
 
 
 __all__ = [
+    ToneRenderer.__name__,
+    Track.__name__,
     parse.__name__,
     render.__name__,
+    render_into.__name__,
+    render_mix.__name__,
     unparse.__name__,
 ]
@@ -0,0 +1,187 @@
+# pylint: disable=missing-module-docstring
+
+from array import array
+from bisect import bisect_right
+from functools import reduce
+from math import gcd
+from typing import Callable
+from typing import Dict
+from typing import Union
+
+from .audio import _segment_spans
+from .audio import _SegmentSpan
+from .model import ToneScript
+
+
+def _to_pcm8(val: float) -> int:
+    # same formulas as _wave._float_to_pcm, clipping values outside of -1.0 to 1.0
+    return round((max(-1.0, min(val, 1.0)) + 1.0) * 127.5)
+
+
+def _to_pcm16(val: float) -> int:
+    return round(-32768.0 + (max(-1.0, min(val, 1.0)) + 1.0) * 32767.5)
+
+
+# converters from `float` samples for each supported buffer format
+_CONVERTERS: Dict[str, Callable[[float], Union[int, float]]] = {
+    "B": _to_pcm8,
+    "h": _to_pcm16,
+    "f": float,
+    "d": float,
+}
+
+# number of samples in the block of silence copied into buffers
+_SILENCE_LEN = 1024
+
+
+def render_into(
+    tone: ToneScript,
+    sample_rate: int,
+    fmt: str,
+    buffer,
+    offset: int = 0
+) -> int:
+    """
+    Writes the audio data for a ToneScript into a writable buffer (`bytearray`, `array`, `mmap`,
+    NumPy array, or any other object supporting the buffer protocol).
+
+    `fmt` is the format of the samples to write, as a `struct` format character:
+
+    * `B`: 8-bit unsigned PCM
+    * `h`: 16-bit signed PCM
+    * `f`: 32-bit float
+    * `d`: 64-bit float
+
+    PCM samples are clipped where the tone's audio exceeds the range of the format.
+
+    Samples are written starting from the beginning of the buffer, beginning with the sample at
+    position `offset` within the tone, until the buffer is full or the tone ends. Returns the
+    number of samples written; to continue the tone in another call (e.g. to fill the next
+    buffer of an audio stream), pass the previous `offset` plus this number as the new `offset`.
+
+    The cadence of the tone is worked out on every call; when filling buffers repeatedly (e.g.
+    from an audio callback), use a ToneRenderer instead.
+    """
+
+    renderer = ToneRenderer(tone, sample_rate, fmt)
+    renderer.position = offset
+
+    return renderer.render_into(buffer)
+
+
+class ToneRenderer:
+    """
+    Writes the audio data for a ToneScript into writable buffers, continuing the tone from one
+    call to the next.
+
+    The cadence and waveforms of the tone are worked out once, when the renderer is created, so
+    writing samples only involves copying them into the buffer; changes made to the tone
+    afterwards are not reflected in the audio written.
+    """
+
+    # pylint: disable=too-few-public-methods
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(self, tone: ToneScript, sample_rate: int, fmt: str):
+        convert = _CONVERTERS.get(fmt)
+        if convert is None:
+            raise ValueError(f"sample format not supported: {fmt}")
+        self._fmt = fmt
+
+        self._spans = _segment_spans(tone, sample_rate)
+        self._starts = [span.start for span in self._spans]
+        self._waves = [_wave_table(span, fmt, convert) for span in self._spans]
+        self._silence = memoryview(array(fmt, [convert(0.0)]) * _SILENCE_LEN)
+
+        self._buffer = None
+        self._view = None
+
+        self.position = 0
+        """
+        Position (in samples) within the tone of the next sample to write.
+        """
+
+    def render_into(self, buffer) -> int:
+        """
+        Writes samples into a writable buffer, starting from the beginning of the buffer and from
+        the current position within the tone, until the buffer is full or the tone ends.
+
+        Returns the number of samples written, and advances the position by that amount. See
+        `render_into` for the supported buffers and sample formats.
+
+        A view of the most recent buffer is kept between calls so that it does not need to be
+        created again; while it is kept, the buffer cannot be resized.
+        """
+
+        if self.position < 0:
+            raise ValueError(f"position must not be negative: {self.position}")
+
+        if buffer is not self._buffer:
+            view = memoryview(buffer)
+            if view.format != self._fmt or view.ndim != 1:
+                view = view.cast("B").cast(self._fmt)
+            self._buffer = buffer
+            self._view = view
+
+        view = self._view
+        spans = self._spans
+        offset = self.position
+
+        capacity = len(view)
+        written = 0
+        span_idx = max(bisect_right(self._starts, offset) - 1, 0)
+
+        while written < capacity and span_idx < len(spans):
+            span = spans[span_idx]
+            pos = offset + written - span.start
+
+            if pos < span.on_count:
+                count = min(span.on_count - pos, capacity - written)
+                _copy_cycle(self._waves[span_idx], pos, view, written, count)
+                written += count
+                pos += count
+
+            count = min(span.on_count + span.off_count - pos, capacity - written)
+            if count > 0:
+                _copy_cycle(self._silence, 0, view, written, count)
+                written += count
+
+            span_idx += 1
+
+        self.position += written
+
+        return written
+
+
+def _wave_table(
+    span: _SegmentSpan,
+    fmt: str,
+    convert: Callable[[float], Union[int, float]]
+) -> memoryview:
+    # the combined waveform of the segment's components repeats after the least common multiple
+    # of their periods; it never needs to be longer than the segment's sound
+    period = reduce(lambda a, b: a * b // gcd(a, b), (len(wave) for wave in span.waves), 1)
+    length = min(period, span.on_count)
+
+    samples = []
+    for pos in range(length):
+        # components are added in the same order as in generate(), so samples are identical
+        val = 0.0
+        for wave in span.waves:
+            val += wave[pos % len(wave)]
+        samples.append(convert(val))
+
+    return memoryview(array(fmt, samples))
+
+
+def _copy_cycle(table: memoryview, start: int, view: memoryview, dest: int, count: int) -> None:
+    # copies `count` samples from a table that repeats indefinitely, starting at position `start`
+    # of the table, into the view starting at position `dest`
+    size = len(table)
+    start %= size
+    while count > 0:
+        chunk = min(count, size - start)
+        view[dest:dest + chunk] = table[start:start + chunk]
+        dest += chunk
+        count -= chunk
+        start = 0
@@ -1,6 +1,7 @@
 # pylint: disable=missing-module-docstring
 
 from decimal import Decimal
+from functools import lru_cache
 
 from lark import Lark
 from lark import Token
@@ -56,8 +57,7 @@ def parse(script: str) -> ToneScript:
     Parses a ToneScript string into an equivalent object representation.
     """
 
-    parser = Lark.open("tonescript.lark", rel_to=__file__)
-    ast = parser.parse(script)
+    ast = _parser().parse(script)
 
     model = _TransformToModel().transform(ast)
 
@@ -72,6 +72,13 @@ def unparse(obj: ToneScript) -> str:
     return _unparse_tonescript(obj)
 
 
+@lru_cache(maxsize=None)
+def _parser() -> Lark:
+    # building the parser from the grammar is far more expensive than parsing a single script,
+    # so it is only done once
+    return Lark.open("tonescript.lark", rel_to=__file__)
+
+
 def _duration_str(val: Decimal) -> str:
     if val.is_infinite():
         return "*"
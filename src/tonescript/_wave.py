@@ -2,8 +2,11 @@
 
 import wave
 from struct import pack
+from typing import Iterable
 
+from .audio import Track
 from .audio import generate
+from .audio import mix
 from .model import ToneScript
 
 
@@ -16,6 +19,35 @@ def render(tone: ToneScript, path: str, sample_rate: int, sample_width: int) ->
 
     float_samples = generate(tone, sample_rate)
 
+    _write(path, float_samples, 1, sample_rate, sample_width)
+
+
+def render_mix(
+    tracks: Iterable[Track],
+    path: str,
+    sample_rate: int,
+    sample_width: int,
+    channels: int = 1
+) -> None:
+    """
+    Writes the audio data for several ToneScripts played together to a WAV file.
+
+    Each tone is placed in the mix according to its track's start time, gain and channel. Where
+    the combined tones exceed the range of the sample format, the audio is clipped.
+    """
+
+    float_samples = (max(-1.0, min(f, 1.0)) for f in mix(tracks, sample_rate, channels))
+
+    _write(path, float_samples, channels, sample_rate, sample_width)
+
+
+def _write(
+    path: str,
+    float_samples: Iterable[float],
+    channels: int,
+    sample_rate: int,
+    sample_width: int
+) -> None:
     int_samples = list(_float_to_pcm(f, sample_width) for f in float_samples)
     if sample_width == 1:
         buffer = pack(f"<{len(int_samples)}B", *int_samples)
@@ -26,7 +58,7 @@ def render(tone: ToneScript, path: str, sample_rate: int, sample_width: int) ->
 
     with wave.open(path, "wb") as file:
         file: wave.Wave_write
-        file.setnchannels(1)
+        file.setnchannels(channels)
         file.setsampwidth(sample_width)
         file.setframerate(sample_rate)
         file.writeframes(buffer)
@@ -12,6 +12,8 @@ from math import ceil
 from math import pi
 from math import sin
 from typing import Iterable
+from typing import List
+from typing import NamedTuple
 from typing import Sequence
 
 from .model import CadenceSection
@@ -32,77 +34,177 @@ def generate(tone: ToneScript, sample_rate: int) -> Iterable[float]:
     return _expand_cadence(tone, sample_rate)
 
 
-def _expand_cadence(tone: ToneScript, sample_rate: int) -> Iterable[float]:
-    tone_secs = (
-        _expand_sec(sec, tone.freqscript.components, sample_rate)
-        for sec
-        in tone.cadscript.sections
-    )
+class Track:
+    """
+    Placement of a ToneScript within a mix of several tones.
+    """
 
-    return chain(*tone_secs)
+    # pylint: disable=too-few-public-methods
+
+    def __init__(
+        self,
+        tone: ToneScript = None,
+        start: Decimal = Decimal(0),
+        gain: float = 1.0,
+        channel: int = 0
+    ):
+        self.tone = tone
+        """
+        Tone to play.
+        """
+
+        self.start = start
+        """
+        Time at which the tone starts within the mix (in seconds).
+        """
+
+        self.gain = gain
+        """
+        Factor by which the tone's audio samples are multiplied.
+        """
+
+        self.channel = channel
+        """
+        Channel of the mix that the tone plays on. `0` corresponds to the first channel, and so
+        on.
+        """
+
+
+def mix(tracks: Iterable[Track], sample_rate: int, channels: int = 1) -> Sequence[float]:
+    """
+    Generates the audio data for several ToneScripts played together.
 
+    Returns a sequence of audio samples represented as `float` values, interleaved by channel
+    (the first sample of each channel, then the second sample of each channel, and so on). The
+    mix lasts until the last of its tones ends; tones that overlap on the same channel are
+    added together, so samples may fall outside of the range `-1.0` to `1.0`.
+    """
 
-def _expand_sec(
-    sec: CadenceSection,
-    comps: Sequence[FrequencyComponent],
-    sample_rate: int
-) -> Iterable[float]:
-    if sec.duration.is_infinite():
-        sec_duration = sum(s.duration_on + s.duration_off for s in sec.segments)
-    else:
-        sec_duration = sec.duration
-    sec_sample_count = ceil(sec_duration * sample_rate)
+    placed = []
+    frame_count = 0
+    for track in tracks:
+        if not 0 <= track.channel < channels:
+            raise ValueError(f"channel out of range: {track.channel}")
+        if track.start < 0:
+            raise ValueError(f"start must not be negative: {track.start}")
+
+        offset = ceil(track.start * sample_rate)
+        spans = _segment_spans(track.tone, sample_rate)
+        if spans:
+            last = spans[-1]
+            frame_count = max(frame_count, offset + last.start + last.on_count + last.off_count)
+        placed.append((track, offset, spans))
+
+    samples = [0.0] * (frame_count * channels)
+
+    # each tone is synthesized once, directly into the shared timeline; the sine wave periods
+    # are cached at unit amplitude, so all tones using the same frequency share them, and each
+    # component's level and the track's gain are applied while adding it into the mix
+    for track, offset, spans in placed:
+        for span in spans:
+            first = (offset + span.start) * channels + track.channel
+            last = first + span.on_count * channels
+            for comp in span.comps:
+                scale = track.gain * _amplitude(comp.level)
+                wave = cycle(_unit_wave(comp.frequency, sample_rate))
+                samples[first:last:channels] = [
+                    sample + scale * val
+                    for sample, val
+                    in zip(samples[first:last:channels], wave)
+                ]
+
+    return samples
+
+
+class _SegmentSpan(NamedTuple):
+    # position of the segment's first sample within the tone
+    start: int
+    on_count: int
+    off_count: int
+    # frequency components the segment uses, and one period of the sine wave for each
+    comps: Sequence[FrequencyComponent]
+    waves: Sequence[Sequence[float]]
 
+
+def _expand_cadence(tone: ToneScript, sample_rate: int) -> Iterable[float]:
     tone_segs = (
-        _expand_seg(seg, comps, sec_sample_count, sample_rate)
-        for seg
-        in sec.segments
+        chain(
+            islice(map(sum, zip(*map(cycle, span.waves))), span.on_count),
+            repeat(0, span.off_count)
+        )
+        for span
+        in _segment_spans(tone, sample_rate)
     )
 
     return chain(*tone_segs)
 
 
-def _expand_seg(
+def _segment_spans(tone: ToneScript, sample_rate: int) -> List[_SegmentSpan]:
+    spans = []
+    start = 0
+
+    for sec in tone.cadscript.sections:
+        for seg in sec.segments:
+            span = _segment_span(seg, sec, tone.freqscript.components, start, sample_rate)
+            spans.append(span)
+            start += span.on_count + span.off_count
+
+    return spans
+
+
+def _segment_span(
     seg: ToneSegment,
+    sec: CadenceSection,
     comps: Sequence[FrequencyComponent],
-    max_len: int,
+    start: int,
     sample_rate: int
-) -> Iterable[float]:
-    # get list of frequency components used by this segment
-    seg_comps = [comps[n - 1] for n in seg.freq_nums if n > 0]
-
-    # get sine wave generators for each component
-    wave_comps = (cycle(_freq_comp(comp.frequency, comp.level, sample_rate)) for comp in seg_comps)
+) -> _SegmentSpan:
+    if sec.duration.is_infinite():
+        sec_duration = sum(s.duration_on + s.duration_off for s in sec.segments)
+    else:
+        sec_duration = sec.duration
+    max_len = ceil(sec_duration * sample_rate)
 
-    # combine sine waves to get tone waveform
-    wave = map(sum, zip(*wave_comps))
+    # get one period of the sine wave for each frequency component used by this segment
+    seg_comps = [comps[n - 1] for n in seg.freq_nums if n > 0]
+    waves = [_freq_comp(comp.frequency, comp.level, sample_rate) for comp in seg_comps]
 
-    if seg.duration_on.is_infinite():
+    if not waves:
+        # a segment without frequency components has no sound to play
+        on_sample_count = 0
+    elif seg.duration_on.is_infinite():
         on_sample_count = max_len
     else:
         on_sample_count = min(ceil(seg.duration_on * sample_rate), max_len)
-    tone_on = islice(wave, on_sample_count)
 
     if seg.duration_off.is_infinite():
         off_sample_count = max_len
     else:
         off_sample_count = min(ceil(seg.duration_off * sample_rate), max_len)
-    tone_off = repeat(0, off_sample_count)
 
-    return chain(tone_on, tone_off)
+    return _SegmentSpan(start, on_sample_count, off_sample_count, seg_comps, waves)
 
 
 @lru_cache
 def _freq_comp(frequency: int, level: Decimal, sample_rate: int) -> Sequence[float]:
-    # convert level in dBm (decibel-millivolt) to amplitude/power in mW (milliwatt)
-    #   mW = 10 ^ (dBm / 10)
-    # 1 mW = 0 dBm
-    amplitude = 10 ** (float(level) / 10)
+    amplitude = _amplitude(level)
+
+    return [amplitude * val for val in _unit_wave(frequency, sample_rate)]
+
 
+@lru_cache
+def _unit_wave(frequency: int, sample_rate: int) -> Sequence[float]:
     period = ceil(sample_rate / frequency)
 
     return [
-        amplitude * sin(2 * pi * frequency * ((x % period) / sample_rate))
+        sin(2 * pi * frequency * ((x % period) / sample_rate))
         for x
         in range(period)
     ]
+
+
+def _amplitude(level: Decimal) -> float:
+    # convert level in dBm (decibel-millivolt) to amplitude/power in mW (milliwatt)
+    #   mW = 10 ^ (dBm / 10)
+    # 1 mW = 0 dBm
+    return 10 ** (float(level) / 10)
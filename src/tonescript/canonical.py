@@ -0,0 +1,190 @@
+"""
+Used for reducing ToneScripts to a canonical form, so that tones which sound the same can be
+recognized as equivalent even when their scripts differ.
+"""
+
+from decimal import Decimal
+from typing import Dict
+from typing import Generic
+from typing import Hashable
+from typing import List
+from typing import Sequence
+from typing import Tuple
+from typing import TypeVar
+
+# pylint: disable=duplicate-code
+from .model import CadenceSection
+from .model import CadScript
+from .model import FreqScript
+from .model import FrequencyComponent
+from .model import ToneScript
+from .model import ToneSegment
+# pylint: enable=duplicate-code
+
+
+def canonicalize(tone: ToneScript) -> ToneScript:
+    """
+    Returns the canonical form of a ToneScript as a new object.
+
+    In the canonical form:
+
+    * frequency components not used by any tone segment are removed, duplicate components are
+      combined, and the remaining components are ordered by frequency and level
+    * tone segment frequency ordinals refer to the reordered components and are sorted
+    * segments that play no sound (no frequency components or no duration of sound) are
+      represented as silence only (`0/n/0`)
+    * durations and levels are normalized, so values such as `0.50` and `.5` are identical
+
+    Segments are never combined, so the canonical form renders the same audio samples as the
+    original tone (up to rounding where a segment sums more than two frequency components).
+    """
+
+    comps = tone.freqscript.components
+
+    # order the used components by value and give identical components the same ordinal
+    used_nums = {
+        n
+        for sec in tone.cadscript.sections
+        for seg in sec.segments
+        for n in seg.freq_nums
+        if n > 0
+    }
+    comp_values = sorted({_comp_value(comps[n - 1]) for n in used_nums})
+    value_nums = {value: num for num, value in enumerate(comp_values, start=1)}
+    num_map = {n: value_nums[_comp_value(comps[n - 1])] for n in used_nums}
+
+    sections = [
+        CadenceSection(_normalize(sec.duration), _canonical_segments(sec.segments, num_map))
+        for sec
+        in tone.cadscript.sections
+    ]
+
+    return ToneScript(
+        FreqScript(FrequencyComponent(freq, level) for freq, level in comp_values),
+        CadScript(sections)
+    )
+
+
+def canonical_key(tone: ToneScript) -> Hashable:
+    """
+    Returns a hashable value identifying a ToneScript's canonical form.
+
+    ToneScripts that have equal keys are equivalent.
+    """
+
+    return _key(canonicalize(tone))
+
+
+K = TypeVar("K", bound=Hashable)
+
+
+class EquivalenceIndex(Generic[K]):
+    """
+    Groups named ToneScripts into classes of equivalent tones, using their canonical keys.
+
+    Work that only depends on how a tone sounds (rendering, storage, etc.) only needs to be done
+    once for each class.
+    """
+
+    def __init__(self):
+        self._classes: Dict[Hashable, Tuple[ToneScript, List[K]]] = {}
+        self._keys: Dict[K, Hashable] = {}
+
+    def __len__(self) -> int:
+        return len(self._classes)
+
+    def add(self, name: K, tone: ToneScript) -> ToneScript:
+        """
+        Adds a named ToneScript to the index.
+
+        Returns the canonical ToneScript shared by all tones equivalent to the one added.
+        """
+
+        if name in self._keys:
+            raise ValueError(f"tone already added: {name}")
+
+        canonical = canonicalize(tone)
+        key = _key(canonical)
+
+        entry = self._classes.setdefault(key, (canonical, []))
+        entry[1].append(name)
+        self._keys[name] = key
+
+        return entry[0]
+
+    def canonical(self, name: K) -> ToneScript:
+        """
+        Returns the canonical ToneScript for a named tone.
+        """
+
+        return self._classes[self._keys[name]][0]
+
+    def equivalents(self, name: K) -> Sequence[K]:
+        """
+        Returns the names of all tones equivalent to a named tone, including that tone.
+        """
+
+        return list(self._classes[self._keys[name]][1])
+
+    def groups(self) -> Sequence[Tuple[ToneScript, Sequence[K]]]:
+        """
+        Returns each class of equivalent tones, as its canonical ToneScript and the names of its
+        tones.
+        """
+
+        return [(canonical, list(names)) for canonical, names in self._classes.values()]
+
+
+def _canonical_segments(
+    segments: Sequence[ToneSegment],
+    num_map: Dict[int, int]
+) -> List[ToneSegment]:
+    result: List[ToneSegment] = []
+
+    for seg in segments:
+        on = _normalize(seg.duration_on)
+        off = _normalize(seg.duration_off)
+        freq_nums = sorted(num_map[n] for n in seg.freq_nums if n > 0)
+
+        if not freq_nums or on == 0:
+            # segment plays no sound, so only its silence is rendered
+            on, freq_nums = Decimal(0), [0]
+
+        result.append(ToneSegment(on, off, freq_nums))
+
+    return result
+
+
+def _comp_value(comp: FrequencyComponent) -> Tuple[int, Decimal]:
+    return (comp.frequency, _normalize(comp.level))
+
+
+def _key(tone: ToneScript) -> Hashable:
+    return (
+        tuple((comp.frequency, comp.level) for comp in tone.freqscript.components),
+        tuple(
+            (
+                sec.duration,
+                tuple(
+                    (seg.duration_on, seg.duration_off, tuple(seg.freq_nums))
+                    for seg
+                    in sec.segments
+                )
+            )
+            for sec
+            in tone.cadscript.sections
+        )
+    )
+
+
+def _normalize(val: Decimal) -> Decimal:
+    if val.is_infinite():
+        return val
+
+    val = val.normalize()
+
+    # keep whole numbers in integer form (normalize() would turn 10 into 1E+1)
+    if val.as_tuple().exponent > 0:
+        val = val.quantize(Decimal(1))
+
+    return val
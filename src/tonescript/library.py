@@ -0,0 +1,329 @@
+"""
+Compact binary storage for named collections of ToneScripts.
+
+A tone library is written once with `write_library` and opened with `ToneLibrary`, which
+memory-maps the file and only decodes a tone when it is looked up by name.
+"""
+
+import mmap
+from decimal import Decimal
+from struct import Struct
+from struct import error as StructError
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Mapping
+from typing import Optional
+from typing import Tuple
+
+# pylint: disable=duplicate-code
+from .model import CadenceSection
+from .model import CadScript
+from .model import FreqScript
+from .model import FrequencyComponent
+from .model import ToneScript
+from .model import ToneSegment
+# pylint: enable=duplicate-code
+
+
+# file layout (all values little-endian):
+#   header
+#   tone index      (one record per tone, sorted by UTF-8 encoded name)
+#   component table (interned frequency components shared by all tones)
+#   component refs  (per-tone indexes into the component table)
+#   section records
+#   segment records
+#   freq num pool   (frequency component ordinals used by segments)
+#   name pool       (UTF-8 encoded tone names)
+_MAGIC = b"TSLB"
+_VERSION = 1
+
+_HEADER = Struct("<4sHH7I")
+_TONE = Struct("<6I")
+_COMPONENT = Struct("<Iqb")
+_COMPONENT_REF = Struct("<I")
+_SECTION = Struct("<qbII")
+_SEGMENT = Struct("<qbqbII")
+_FREQ_NUM = Struct("<H")
+
+# decimals are stored as a signed 64-bit coefficient and a signed 8-bit exponent;
+# infinite durations use an exponent value that is never produced by a finite value
+_INF_EXPONENT = 127
+
+
+def write_library(tones: Mapping[str, ToneScript], path: str) -> None:
+    """
+    Writes a collection of named ToneScripts to a binary tone library file.
+
+    Frequency components are interned across the whole collection, so components shared by
+    many tones are only stored once.
+    """
+
+    # pylint: disable=too-many-locals
+
+    names = sorted(tones, key=lambda n: n.encode("utf-8"))
+
+    comp_ids: Dict[Tuple[int, Decimal], int] = {}
+    comps = bytearray()
+    comp_refs = bytearray()
+    tone_recs = bytearray()
+    sec_recs = bytearray()
+    seg_recs = bytearray()
+    freq_nums = bytearray()
+    name_pool = bytearray()
+
+    comp_ref_count = 0
+    sec_count = 0
+    seg_count = 0
+    freq_num_count = 0
+
+    for name in names:
+        try:
+            tone = tones[name]
+            encoded_name = name.encode("utf-8")
+
+            tone_recs += _TONE.pack(
+                len(name_pool),
+                len(encoded_name),
+                comp_ref_count,
+                len(tone.freqscript.components),
+                sec_count,
+                len(tone.cadscript.sections)
+            )
+            name_pool += encoded_name
+
+            for comp in tone.freqscript.components:
+                key = (comp.frequency, comp.level)
+                comp_id = comp_ids.get(key)
+                if comp_id is None:
+                    comp_id = len(comp_ids)
+                    comp_ids[key] = comp_id
+                    comps += _COMPONENT.pack(comp.frequency, *_pack_decimal(comp.level))
+                comp_refs += _COMPONENT_REF.pack(comp_id)
+                comp_ref_count += 1
+
+            for sec in tone.cadscript.sections:
+                sec_recs += _SECTION.pack(
+                    *_pack_decimal(sec.duration),
+                    seg_count,
+                    len(sec.segments)
+                )
+                sec_count += 1
+
+                for seg in sec.segments:
+                    seg_recs += _SEGMENT.pack(
+                        *_pack_decimal(seg.duration_on),
+                        *_pack_decimal(seg.duration_off),
+                        freq_num_count,
+                        len(seg.freq_nums)
+                    )
+                    seg_count += 1
+
+                    for num in seg.freq_nums:
+                        freq_nums += _FREQ_NUM.pack(num)
+                        freq_num_count += 1
+        except (StructError, ValueError) as ex:
+            raise ValueError(f"tone cannot be stored in a tone library: {name}") from ex
+
+    comps_offset = _HEADER.size + len(tone_recs)
+    comp_refs_offset = comps_offset + len(comps)
+    secs_offset = comp_refs_offset + len(comp_refs)
+    segs_offset = secs_offset + len(sec_recs)
+    freq_nums_offset = segs_offset + len(seg_recs)
+    names_offset = freq_nums_offset + len(freq_nums)
+
+    header = _HEADER.pack(
+        _MAGIC,
+        _VERSION,
+        0,
+        len(names),
+        comps_offset,
+        comp_refs_offset,
+        secs_offset,
+        segs_offset,
+        freq_nums_offset,
+        names_offset
+    )
+
+    with open(path, "wb") as file:
+        for part in (header, tone_recs, comps, comp_refs, sec_recs, seg_recs, freq_nums, name_pool):
+            file.write(part)
+
+
+class ToneLibrary(Mapping[str, ToneScript]):
+    """
+    Read-only mapping of names to ToneScripts, backed by a memory-mapped tone library file.
+
+    Opening a library only reads its header; each tone is decoded from the mapped file when it
+    is looked up, and a new ToneScript object is returned on every lookup.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(self, path: str):
+        with open(path, "rb") as file:
+            self._buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            (
+                magic,
+                version,
+                _,
+                self._tone_count,
+                self._comps_offset,
+                self._comp_refs_offset,
+                self._secs_offset,
+                self._segs_offset,
+                self._freq_nums_offset,
+                self._names_offset
+            ) = _HEADER.unpack_from(self._buffer, 0)
+        except StructError as ex:
+            self._buffer.close()
+            raise ValueError(f"not a supported tone library file: {path}") from ex
+
+        # each table must start after the previous one, and all of them must be within the file
+        offsets = [
+            _HEADER.size + self._tone_count * _TONE.size,
+            self._comps_offset,
+            self._comp_refs_offset,
+            self._secs_offset,
+            self._segs_offset,
+            self._freq_nums_offset,
+            self._names_offset,
+            len(self._buffer)
+        ]
+        valid_offsets = all(a <= b for a, b in zip(offsets, offsets[1:]))
+
+        if magic != _MAGIC or version != _VERSION or not valid_offsets:
+            self._buffer.close()
+            raise ValueError(f"not a supported tone library file: {path}")
+
+    def __enter__(self) -> "ToneLibrary":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __getitem__(self, name: str) -> ToneScript:
+        index = self._find(name.encode("utf-8"))
+        if index is None:
+            raise KeyError(name)
+        return self._decode(index)
+
+    def __contains__(self, name: object) -> bool:
+        return isinstance(name, str) and self._find(name.encode("utf-8")) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        for index in range(self._tone_count):
+            yield self._name_at(index).decode("utf-8")
+
+    def __len__(self) -> int:
+        return self._tone_count
+
+    def close(self) -> None:
+        """
+        Releases the memory mapping of the library file.
+        """
+
+        self._buffer.close()
+
+    def _find(self, name: bytes) -> Optional[int]:
+        # binary search over the tone index, which is sorted by encoded name
+        low = 0
+        high = self._tone_count
+        while low < high:
+            mid = (low + high) // 2
+            mid_name = self._name_at(mid)
+            if mid_name < name:
+                low = mid + 1
+            elif mid_name > name:
+                high = mid
+            else:
+                return mid
+        return None
+
+    def _name_at(self, index: int) -> bytes:
+        name_start, name_len, *_ = _TONE.unpack_from(
+            self._buffer,
+            _HEADER.size + index * _TONE.size
+        )
+        start = self._names_offset + name_start
+        return self._buffer[start:start + name_len]
+
+    def _decode(self, index: int) -> ToneScript:
+        # pylint: disable=too-many-locals
+
+        buf = self._buffer
+
+        _, _, comp_ref_start, comp_count, sec_start, sec_count = _TONE.unpack_from(
+            buf,
+            _HEADER.size + index * _TONE.size
+        )
+
+        comps = []
+        for ref in range(comp_ref_start, comp_ref_start + comp_count):
+            (comp_id,) = _COMPONENT_REF.unpack_from(
+                buf,
+                self._comp_refs_offset + ref * _COMPONENT_REF.size
+            )
+            frequency, level_coef, level_exp = _COMPONENT.unpack_from(
+                buf,
+                self._comps_offset + comp_id * _COMPONENT.size
+            )
+            comps.append(FrequencyComponent(frequency, _unpack_decimal(level_coef, level_exp)))
+
+        secs = []
+        for sec_idx in range(sec_start, sec_start + sec_count):
+            dur_coef, dur_exp, seg_start, seg_count = _SECTION.unpack_from(
+                buf,
+                self._secs_offset + sec_idx * _SECTION.size
+            )
+            secs.append(CadenceSection(
+                _unpack_decimal(dur_coef, dur_exp),
+                self._decode_segments(seg_start, seg_count)
+            ))
+
+        return ToneScript(FreqScript(comps), CadScript(secs))
+
+    def _decode_segments(self, start: int, count: int) -> List[ToneSegment]:
+        segs = []
+        for seg_idx in range(start, start + count):
+            on_coef, on_exp, off_coef, off_exp, num_start, num_count = _SEGMENT.unpack_from(
+                self._buffer,
+                self._segs_offset + seg_idx * _SEGMENT.size
+            )
+            nums_offset = self._freq_nums_offset + num_start * _FREQ_NUM.size
+            freq_nums = [
+                n
+                for (n,)
+                in _FREQ_NUM.iter_unpack(
+                    self._buffer[nums_offset:nums_offset + num_count * _FREQ_NUM.size]
+                )
+            ]
+            segs.append(ToneSegment(
+                _unpack_decimal(on_coef, on_exp),
+                _unpack_decimal(off_coef, off_exp),
+                freq_nums
+            ))
+        return segs
+
+
+def _pack_decimal(val: Decimal) -> Tuple[int, int]:
+    if val.is_infinite():
+        return (0, _INF_EXPONENT)
+
+    sign, digits, exponent = val.as_tuple()
+    coefficient = int("".join(map(str, digits)) or "0")
+    if sign:
+        coefficient = -coefficient
+
+    if not -128 <= exponent < _INF_EXPONENT or not -2 ** 63 <= coefficient < 2 ** 63:
+        raise ValueError(f"value cannot be stored in a tone library: {val}")
+
+    return (coefficient, exponent)
+
+
+def _unpack_decimal(coefficient: int, exponent: int) -> Decimal:
+    if exponent == _INF_EXPONENT:
+        return Decimal("inf")
+    return Decimal(coefficient).scaleb(exponent)
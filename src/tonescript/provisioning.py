@@ -0,0 +1,189 @@
+"""
+Loads ToneScripts from Sipura, Linksys, and Cisco provisioning (flat profile) XML files.
+
+Provisioning files define tones as fields such as `Dial_Tone` and `Busy_Tone`, repeated for each
+device profile:
+
+    <flat-profile>
+      <Dial_Tone ua="na">350@-19,440@-19;10(*/0/1+2)</Dial_Tone>
+      <Busy_Tone ua="na">480@-19,620@-19;10(.5/.5/1+2)</Busy_Tone>
+    </flat-profile>
+"""
+
+import re
+import xml.etree.ElementTree as ET
+from typing import BinaryIO
+from typing import Dict
+from typing import List
+from typing import Sequence
+from typing import Set
+from typing import Tuple
+from typing import Union
+
+from ._parser import parse
+from .model import ToneScript
+
+
+ProfileKey = Tuple[str, int]
+"""
+Identifies a device profile by the name of the file it was loaded from and the position
+(starting at `0`) of its `flat-profile` element within that file.
+"""
+
+_PROFILE_TAG = "flat-profile"
+
+# tone fields are named like "Dial_Tone" or "SIT1_Tone"; some configs append a line/index number
+# and/or an underscore to field names (e.g. "Ring_Back_Tone_", "Dial_Tone_2_"). only the trailing
+# underscore is dropped, so numbered fields are kept separate (e.g. "Dial_Tone_2")
+_TONE_FIELD_PATTERN = re.compile(r"^(?P<name>\w*_Tone(?:_\d+)?)_?$")
+
+
+class ProvisioningIndex:
+    """
+    Index of the ToneScript fields found in one or more provisioning files.
+
+    Files are read incrementally, so only the element currently being read is held in memory.
+    Identical scripts are stored once no matter how many profiles use them, and each distinct
+    script is parsed the first time one of its tones is requested.
+    """
+
+    def __init__(self):
+        self._scripts: List[str] = []
+        self._script_ids: Dict[str, int] = {}
+        self._tones: Dict[int, ToneScript] = {}
+        self._profiles: Dict[ProfileKey, Dict[str, int]] = {}
+        self._fields: Dict[str, List[ProfileKey]] = {}
+        self._sources: Set[str] = set()
+
+    @property
+    def fields(self) -> Sequence[str]:
+        """
+        Names of all tone fields found in the loaded files.
+        """
+
+        return list(self._fields)
+
+    @property
+    def profiles(self) -> Sequence[ProfileKey]:
+        """
+        Keys of all device profiles found in the loaded files, in the order they were read.
+        """
+
+        return list(self._profiles)
+
+    @property
+    def scripts(self) -> Sequence[str]:
+        """
+        Distinct ToneScript strings found in the loaded files.
+        """
+
+        return list(self._scripts)
+
+    def load(self, source: Union[str, BinaryIO], name: str = None) -> None:
+        """
+        Reads the tone fields from a provisioning file, given either its path or a binary file
+        object.
+
+        Profiles from the file are identified using `name`, which defaults to the path of the
+        file (or the `name` attribute of a file object). Each file loaded must have a different
+        name.
+        """
+
+        if name is None:
+            name = source if isinstance(source, str) else getattr(source, "name", None)
+        if not isinstance(name, str) or not name:
+            raise ValueError("name must be specified for a file object without a name")
+        if name in self._sources:
+            raise ValueError(f"file already loaded: {name}")
+
+        # the file's tone fields are only added to the index once the whole file has been read,
+        # so a file that cannot be read leaves the index unchanged
+        profiles: Dict[ProfileKey, Dict[str, str]] = {}
+        scripts: Dict[str, str] = {}
+        profile = None
+        root = None
+
+        for event, elem in ET.iterparse(source, events=("start", "end")):
+            tag = _local_name(elem.tag)
+
+            if event == "start":
+                if root is None:
+                    root = elem
+                if tag == _PROFILE_TAG:
+                    profile = profiles.setdefault((name, len(profiles)), {})
+                continue
+
+            if tag == _PROFILE_TAG:
+                profile = None
+                # discard the finished profile so the document is never held in memory
+                root.clear()
+                continue
+
+            if profile is not None:
+                match = _TONE_FIELD_PATTERN.match(tag)
+                script = (elem.text or "").strip()
+                if match and script:
+                    # share one string between profiles using identical scripts
+                    profile[match.group("name")] = scripts.setdefault(script, script)
+                elem.clear()
+
+        self._sources.add(name)
+        for key, fields in profiles.items():
+            self._profiles[key] = {field: self._intern(script) for field, script in fields.items()}
+            for field in fields:
+                self._fields.setdefault(field, []).append(key)
+
+    def profiles_with(self, field: str) -> Sequence[ProfileKey]:
+        """
+        Returns the keys of the profiles that define a tone field.
+        """
+
+        return list(self._fields.get(field, []))
+
+    def script(self, profile: ProfileKey, field: str) -> str:
+        """
+        Returns the ToneScript string for a tone field of a profile.
+        """
+
+        return self._scripts[self._profiles[profile][field]]
+
+    def tone(self, profile: ProfileKey, field: str) -> ToneScript:
+        """
+        Returns the parsed ToneScript for a tone field of a profile.
+
+        Profiles that use identical scripts share the same ToneScript object, so it should not be
+        modified.
+        """
+
+        return self._tone(self._profiles[profile][field])
+
+    def tones(self, profile: ProfileKey) -> Dict[str, ToneScript]:
+        """
+        Returns the parsed ToneScripts for all tone fields of a profile, keyed by field name.
+        """
+
+        return {
+            field: self._tone(script_id)
+            for field, script_id
+            in self._profiles[profile].items()
+        }
+
+    def _intern(self, script: str) -> int:
+        script_id = self._script_ids.get(script)
+        if script_id is None:
+            script_id = len(self._scripts)
+            self._scripts.append(script)
+            self._script_ids[script] = script_id
+        return script_id
+
+    def _tone(self, script_id: int) -> ToneScript:
+        tone = self._tones.get(script_id)
+        if tone is None:
+            tone = parse(self._scripts[script_id])
+            self._tones[script_id] = tone
+        return tone
+
+
+def _local_name(tag: str) -> str:
+    # strip any namespace from the tag name
+    return tag.rpartition("}")[2]
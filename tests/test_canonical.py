@@ -0,0 +1,69 @@
+import pytest
+
+from tonescript import parse
+from tonescript import unparse
+from tonescript.audio import generate
+from tonescript.canonical import EquivalenceIndex
+from tonescript.canonical import canonical_key
+from tonescript.canonical import canonicalize
+
+
+def test_remaps_component_order():
+    assert _canonical("440@-19,350@-19;10(*/0/2+1)") == "350@-19,440@-19;10(*/0/1+2)"
+
+
+def test_drops_unused_components():
+    assert _canonical("350@-19,620@-24,440@-19;10(*/0/1+3)") == "350@-19,440@-19;10(*/0/1+2)"
+
+
+def test_normalizes_values():
+    assert _canonical("350@-19.0,440@-19;10(0.50/0.500/1+2)") == "350@-19,440@-19;10(.5/.5/1+2)"
+
+
+def test_silent_segments():
+    assert _canonical("480@-24,620@-24;10(.5/.25/1+2,1/.25/0,0/.5/1)") == \
+        "480@-24,620@-24;10(.5/.25/1+2,0/.25/0,0/.5/0)"
+
+
+@pytest.mark.parametrize("script", [
+    "440@-19,350@-19;10(*/0/2+1)",
+    "350@-19,620@-24,440@-19;3(1/.5/1+3,.5/.5/2)",
+    "480@-24,620@-24;10(.5/.25/1+2,1/.25/0)",
+    "480@-24;.3(.25/0/1,.25/.5/1)",
+    "480@-24;10(.5/0/1,*/0/1)",
+])
+def test_renders_same_audio(script):
+    tone = parse(script)
+
+    assert list(generate(canonicalize(tone), 8000)) == list(generate(tone, 8000))
+
+
+def test_equivalent_keys():
+    assert canonical_key(parse("440@-19,350@-19;10(*/0/2+1)")) == \
+        canonical_key(parse("350@-19,440@-19,620@-24;10(*/0/1+2)"))
+    assert canonical_key(parse("350@-19,440@-19;10(*/0/1+2)")) != \
+        canonical_key(parse("350@-19,440@-13;10(*/0/1+2)"))
+
+
+def test_index_groups_equivalent_tones():
+    index = EquivalenceIndex()
+    index.add("dial", parse("350@-19,440@-19;10(*/0/1+2)"))
+    index.add("dial_reordered", parse("440@-19,350@-19;10(*/0/2+1)"))
+    index.add("busy", parse("480@-24,620@-24;10(.5/.5/1+2)"))
+
+    assert len(index) == 2
+    assert index.equivalents("dial") == ["dial", "dial_reordered"]
+    assert index.canonical("dial") is index.canonical("dial_reordered")
+    assert sorted(names for _, names in index.groups()) == [["busy"], ["dial", "dial_reordered"]]
+
+
+def test_index_rejects_duplicate_name():
+    index = EquivalenceIndex()
+    index.add("dial", parse("350@-19,440@-19;10(*/0/1+2)"))
+
+    with pytest.raises(ValueError):
+        index.add("dial", parse("480@-24,620@-24;10(.5/.5/1+2)"))
+
+
+def _canonical(script: str) -> str:
+    return unparse(canonicalize(parse(script)))
@@ -0,0 +1,84 @@
+from decimal import Decimal
+
+import pytest
+
+from tonescript import parse
+from tonescript import unparse
+from tonescript.library import ToneLibrary
+from tonescript.library import write_library
+
+
+SCRIPTS = {
+    "busy": "480@-24,620@-24;10(.5/.5/1+2)",
+    "dial": "350@-19,440@-19;10(*/0/1+2)",
+    "ringback": "440@-19,480@-19;*(2/4/1+2)",
+    "sit": "950@-16,1400@-16,1800@-16;20(.333/0/1,.333/0/2,.333/4/3,0/0/0)",
+}
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "tones.tslb")
+    write_library({name: parse(script) for name, script in SCRIPTS.items()}, path)
+
+    with ToneLibrary(path) as library:
+        assert len(library) == len(SCRIPTS)
+        assert sorted(library) == sorted(SCRIPTS)
+        for name, script in SCRIPTS.items():
+            assert unparse(library[name]) == script
+
+
+def test_preserves_values(tmp_path):
+    path = str(tmp_path / "tones.tslb")
+    write_library({"ringback": parse(SCRIPTS["ringback"])}, path)
+
+    with ToneLibrary(path) as library:
+        tone = library["ringback"]
+
+    assert tone.freqscript.components[1].frequency == 480
+    assert tone.freqscript.components[1].level == Decimal("-19")
+    assert tone.cadscript.sections[0].duration.is_infinite()
+    assert tone.cadscript.sections[0].segments[0].duration_off == Decimal("4")
+    assert tone.cadscript.sections[0].segments[0].freq_nums == [1, 2]
+
+
+def test_missing_name(tmp_path):
+    path = str(tmp_path / "tones.tslb")
+    write_library({"dial": parse(SCRIPTS["dial"])}, path)
+
+    with ToneLibrary(path) as library:
+        assert "busy" not in library
+        with pytest.raises(KeyError):
+            _ = library["busy"]
+
+
+def test_invalid_file(tmp_path):
+    path = tmp_path / "tones.tslb"
+    path.write_bytes(b"not a tone library")
+
+    with pytest.raises(ValueError):
+        ToneLibrary(str(path))
+
+
+def test_truncated_file(tmp_path):
+    path = tmp_path / "tones.tslb"
+    write_library({name: parse(script) for name, script in SCRIPTS.items()}, str(path))
+    path.write_bytes(path.read_bytes()[:-20])
+
+    with pytest.raises(ValueError):
+        ToneLibrary(str(path))
+
+
+def test_value_out_of_range(tmp_path):
+    tone = parse(SCRIPTS["dial"])
+    tone.freqscript.components[0].frequency = 2 ** 32
+
+    with pytest.raises(ValueError, match="dial"):
+        write_library({"dial": tone}, str(tmp_path / "tones.tslb"))
+
+
+def test_decimal_out_of_range(tmp_path):
+    tone = parse(SCRIPTS["busy"])
+    tone.cadscript.sections[0].duration = Decimal("1E+200")
+
+    with pytest.raises(ValueError, match="busy"):
+        write_library({"busy": tone}, str(tmp_path / "tones.tslb"))
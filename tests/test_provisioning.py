@@ -0,0 +1,89 @@
+import xml.etree.ElementTree as ET
+from io import BytesIO
+
+import pytest
+
+from tonescript import unparse
+from tonescript.provisioning import ProvisioningIndex
+
+
+CONFIG = b"""<?xml version="1.0" encoding="UTF-8"?>
+<profiles>
+  <flat-profile>
+    <Dial_Tone ua="na">350@-19,440@-19;10(*/0/1+2)</Dial_Tone>
+    <Busy_Tone ua="na">480@-19,620@-19;10(.5/.5/1+2)</Busy_Tone>
+    <Ring_Back_Tone_ ua="na">440@-19,480@-19;*(2/4/1+2)</Ring_Back_Tone_>
+    <Line_Enable_1_ ua="na">Yes</Line_Enable_1_>
+  </flat-profile>
+  <flat-profile>
+    <Dial_Tone ua="na">350@-19,440@-19;10(*/0/1+2)</Dial_Tone>
+    <Dial_Tone_2_ ua="na">350@-13,440@-13;10(*/0/1+2)</Dial_Tone_2_>
+    <Busy_Tone ua="na"></Busy_Tone>
+  </flat-profile>
+</profiles>
+"""
+
+
+def test_load():
+    index = _load()
+
+    assert index.profiles == [("dump.xml", 0), ("dump.xml", 1)]
+    assert sorted(index.fields) == ["Busy_Tone", "Dial_Tone", "Dial_Tone_2", "Ring_Back_Tone"]
+    assert index.profiles_with("Dial_Tone") == [("dump.xml", 0), ("dump.xml", 1)]
+    assert index.profiles_with("Busy_Tone") == [("dump.xml", 0)]
+    assert index.script(("dump.xml", 0), "Ring_Back_Tone") == "440@-19,480@-19;*(2/4/1+2)"
+
+
+def test_deduplicates_scripts():
+    index = _load()
+
+    assert len(index.scripts) == 4
+    assert index.tone(("dump.xml", 0), "Dial_Tone") is index.tone(("dump.xml", 1), "Dial_Tone")
+
+
+def test_tones():
+    index = _load()
+
+    tones = index.tones(("dump.xml", 0))
+
+    assert {field: unparse(tone) for field, tone in tones.items()} == {
+        "Dial_Tone": "350@-19,440@-19;10(*/0/1+2)",
+        "Busy_Tone": "480@-19,620@-19;10(.5/.5/1+2)",
+        "Ring_Back_Tone": "440@-19,480@-19;*(2/4/1+2)",
+    }
+
+
+def test_numbered_fields():
+    index = _load()
+
+    assert index.script(("dump.xml", 1), "Dial_Tone") == "350@-19,440@-19;10(*/0/1+2)"
+    assert index.script(("dump.xml", 1), "Dial_Tone_2") == "350@-13,440@-13;10(*/0/1+2)"
+
+
+def test_load_requires_unique_name():
+    index = _load()
+
+    with pytest.raises(ValueError):
+        index.load(BytesIO(CONFIG))
+    with pytest.raises(ValueError):
+        index.load(BytesIO(CONFIG), "dump.xml")
+
+
+def test_load_malformed_file():
+    index = ProvisioningIndex()
+
+    with pytest.raises(ET.ParseError):
+        index.load(BytesIO(CONFIG[:CONFIG.rindex(b"<Busy_Tone")]), "dump.xml")
+
+    assert index.profiles == []
+    assert index.fields == []
+    assert index.scripts == []
+
+    index.load(BytesIO(CONFIG), "dump.xml")
+    assert len(index.profiles) == 2
+
+
+def _load() -> ProvisioningIndex:
+    index = ProvisioningIndex()
+    index.load(BytesIO(CONFIG), "dump.xml")
+    return index
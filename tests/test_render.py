@@ -1,6 +1,14 @@
+import wave
 from decimal import Decimal
 
+import pytest
+
+from tonescript import Track
+from tonescript import parse
 from tonescript import render
+from tonescript import render_mix
+from tonescript.audio import generate
+from tonescript.audio import mix
 from tonescript.model import CadScript
 from tonescript.model import CadenceSection
 from tonescript.model import FreqScript
@@ -25,6 +33,49 @@ def test_44100_16():
     _render(44100, 2)
 
 
+def test_mix_stereo():
+    ringback = parse("440@-19,480@-19;2(.5/.5/1+2)")
+    call_waiting = parse("440@-10;1(.3/.2/1)")
+
+    samples = mix([
+        Track(ringback, channel=0),
+        Track(call_waiting, Decimal("0.25"), 0.5, channel=1)
+    ], 8000, 2)
+
+    assert len(samples) == 2 * 8000
+    assert samples[0::2][:8000] == list(generate(ringback, 8000))
+    assert samples[1::2][:2000] == [0.0] * 2000
+    assert samples[1::2][2000:6000] == [0.5 * f for f in generate(call_waiting, 8000)]
+
+
+def test_mix_overlapping():
+    ringback = parse("440@-19,480@-19;2(.5/.5/1+2)")
+    call_waiting = parse("440@-10;1(.3/.2/1)")
+
+    samples = mix([Track(ringback), Track(call_waiting)], 8000)
+
+    expected = [a + b for a, b in zip(generate(ringback, 8000), generate(call_waiting, 8000))]
+    assert samples[:4000] == expected
+
+
+def test_mix_negative_start():
+    with pytest.raises(ValueError):
+        mix([Track(parse("440@-10;1(.3/.2/1)"), Decimal("-0.25"))], 8000)
+
+
+def test_render_mix(tmp_path):
+    path = str(tmp_path / "mix.wav")
+
+    render_mix([
+        Track(parse("440@-19,480@-19;2(.5/.5/1+2)"), channel=0),
+        Track(parse("440@-10;1(.3/.2/1)"), Decimal("1"), channel=1)
+    ], path, 8000, 2, 2)
+
+    with wave.open(path, "rb") as file:
+        assert file.getnchannels() == 2
+        assert file.getnframes() == 12000
+
+
 def _render(sample_rate: int, sample_width: int):
     tone = ToneScript(
         FreqScript([
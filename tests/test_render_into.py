@@ -0,0 +1,87 @@
+from array import array
+from decimal import Decimal
+from struct import pack
+from struct import unpack
+
+import pytest
+
+from tonescript import parse
+from tonescript import ToneRenderer
+from tonescript import render_into
+from tonescript.audio import generate
+
+
+TONE = parse("440@-19,480@-19;1(.2/.3/1+2,.1/.1/0,.25/0/2)")
+
+
+def test_float_matches_generate():
+    expected = list(generate(TONE, 8000))
+    buffer = array("d", bytes(8 * (len(expected) + 10)))
+
+    written = render_into(TONE, 8000, "d", buffer)
+
+    assert written == len(expected)
+    assert list(buffer[:written]) == expected
+    assert list(buffer[written:]) == [0.0] * 10
+
+
+def test_pcm_in_chunks():
+    expected = [round(-32768.0 + (f + 1.0) * 32767.5) for f in generate(TONE, 8000)]
+    buffer = bytearray(2 * 333)
+    samples = []
+    offset = 0
+
+    while True:
+        written = render_into(TONE, 8000, "h", buffer, offset)
+        samples.extend(unpack(f"<{written}h", buffer[:2 * written]))
+        offset += written
+        if written < 333:
+            break
+
+    assert samples == expected
+
+
+def test_renderer_continues_tone():
+    expected = list(generate(TONE, 8000))
+    renderer = ToneRenderer(TONE, 8000, "f")
+    buffer = array("f", bytes(4 * 500))
+    samples = []
+
+    while True:
+        written = renderer.render_into(buffer)
+        samples.extend(buffer[:written])
+        if written < len(buffer):
+            break
+
+    assert renderer.position == len(expected)
+    assert samples == [unpack("f", pack("f", f))[0] for f in expected]
+
+
+def test_reflects_modified_tone():
+    tone = parse("440@-19;1(.2/.3/1)")
+    buffer = array("d", bytes(8 * 8000))
+
+    render_into(tone, 8000, "d", buffer)
+    tone.cadscript.sections[0].segments[0].duration_on = Decimal(".5")
+
+    assert render_into(tone, 8000, "d", buffer) == len(list(generate(tone, 8000)))
+
+
+def test_pcm_clips_loud_tone():
+    tone = parse("350@0,440@0;1(*/0/1+2)")
+    expected = [
+        round(-32768.0 + (max(-1.0, min(f, 1.0)) + 1.0) * 32767.5)
+        for f in generate(tone, 8000)
+    ]
+    buffer = array("h", bytes(2 * 8000))
+
+    written = render_into(tone, 8000, "h", buffer)
+
+    assert written == 8000
+    assert list(buffer) == expected
+    assert max(buffer) == 32767
+
+
+def test_unsupported_format():
+    with pytest.raises(ValueError):
+        render_into(TONE, 8000, "q", bytearray(8))